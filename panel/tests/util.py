@@ -56,6 +56,12 @@ except Exception:
     jupyter_bokeh = None
 jb_available = pytest.mark.skipif(jupyter_bokeh is None, reason="requires jupyter_bokeh")
 
+try:
+    import watchfiles
+except Exception:
+    watchfiles = None
+watchfiles_available = pytest.mark.skipif(watchfiles is None, reason="requires watchfiles")
+
 APP_PATTERN = re.compile(r'Bokeh app running at: http://localhost:(\d+)/')
 ON_POSIX = 'posix' in sys.builtin_module_names
 
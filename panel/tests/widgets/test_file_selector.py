@@ -1,8 +1,12 @@
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from panel.io.state import state
 from panel.models.widgets import DoubleClickEvent
+from panel.tests.util import async_wait_until, watchfiles_available
 from panel.widgets import FileSelector
 
 
@@ -22,6 +26,21 @@ def test_dir(tmp_path):
     yield str(test_dir)
 
 
+@pytest.fixture
+def scan_calls(monkeypatch):
+    from panel.widgets import file_selector
+
+    calls = []
+    scan_path = file_selector._scan_path
+
+    def _scan_path(path, *args):
+        calls.append(path)
+        return scan_path(path, *args)
+
+    monkeypatch.setattr(file_selector, '_scan_path', _scan_path)
+    yield calls
+
+
 def test_file_selector_init(test_dir):
     selector = FileSelector(test_dir)
 
@@ -191,3 +210,287 @@ def test_file_selector_multiple_across_dirs(test_dir):
     }
     assert selector._selector._lists[False].options == ['⬆ ..', 'b']
     assert selector.value == [os.path.join(test_dir, 'subdir1', 'a')]
+
+
+def test_file_selector_symlinks(test_dir):
+    os.symlink(os.path.join(test_dir, 'subdir1'), os.path.join(test_dir, 'link_dir'))
+    os.symlink(os.path.join(test_dir, 'subdir1', 'a'), os.path.join(test_dir, 'link_file'))
+
+    selector = FileSelector(test_dir)
+
+    assert selector._selector.options == {
+        '\U0001f4c1link_dir': os.path.join(test_dir, 'link_dir'),
+        '\U0001f4c1subdir1': os.path.join(test_dir, 'subdir1'),
+        '\U0001f4c1subdir2': os.path.join(test_dir, 'subdir2'),
+        'link_file': os.path.join(test_dir, 'link_file'),
+    }
+
+
+def test_file_selector_broken_symlinks(test_dir):
+    os.symlink(os.path.join(test_dir, 'loop'), os.path.join(test_dir, 'loop'))
+    os.symlink(os.path.join(test_dir, 'missing'), os.path.join(test_dir, 'dangling'))
+
+    selector = FileSelector(test_dir)
+
+    assert selector._selector.options == {
+        '\U0001f4c1subdir1': os.path.join(test_dir, 'subdir1'),
+        '\U0001f4c1subdir2': os.path.join(test_dir, 'subdir2'),
+    }
+
+
+@pytest.mark.parametrize('path', [
+    os.path.join('subdir1', 'a'), 'missing', 'x'*1000, 'null\0byte'
+], ids=['file', 'missing', 'too_long', 'null_byte'])
+def test_file_selector_invalid_path(test_dir, path):
+    selector = FileSelector(test_dir)
+
+    selector._directory.value = os.path.join(test_dir, path)
+    selector._go.clicks = 1
+
+    assert selector._selector.options == ['Entered path is not valid']
+    assert selector._selector.disabled
+    assert selector._cwd == test_dir
+
+
+def test_file_selector_show_hidden(test_dir):
+    os.mkdir(os.path.join(test_dir, '.hidden'))
+
+    selector = FileSelector(test_dir)
+
+    assert '\U0001f4c1.hidden' not in selector._selector.options
+
+    selector = FileSelector(test_dir, show_hidden=True)
+
+    assert selector._selector.options['\U0001f4c1.hidden'] == os.path.join(test_dir, '.hidden')
+
+
+def test_file_selector_root_directory_sibling(tmp_path, test_dir):
+    sibling = tmp_path / 'test_dir2'
+    sibling.mkdir()
+
+    selector = FileSelector(test_dir)
+
+    selector._directory.value = str(sibling)
+
+    assert selector._directory.value == test_dir
+
+
+def test_file_selector_history_bounded(test_dir, monkeypatch):
+    monkeypatch.setattr(FileSelector, '_history_size', 2)
+    selector = FileSelector(test_dir)
+
+    for subdir in ('subdir1', 'subdir2', 'subdir1'):
+        selector._directory.value = os.path.join(test_dir, subdir)
+        selector._go.clicks += 1
+
+    assert list(selector._stack) == [
+        os.path.join(test_dir, 'subdir2'), os.path.join(test_dir, 'subdir1')
+    ]
+    assert selector._position == 1
+
+    selector._back.clicks = 1
+
+    assert selector._cwd == os.path.join(test_dir, 'subdir2')
+    assert selector._back.disabled
+
+
+def test_file_selector_filter(test_dir):
+    selector = FileSelector(test_dir)
+
+    selector._directory.value = os.path.join(test_dir, 'subdir1')
+    selector._go.clicks = 1
+
+    selector._selector._search[False].value_input = 'a*'
+
+    assert selector._selector._lists[False].value == ['a']
+
+
+def test_file_selector_double_click_dir(test_dir):
+    selector = FileSelector(test_dir)
+
+    selector._select_and_go(DoubleClickEvent(option='\U0001f4c1subdir1', model=None))
+
+    assert selector._cwd == os.path.join(test_dir, 'subdir1')
+
+    selector._select_and_go(DoubleClickEvent(option='a', model=None))
+
+    assert selector._cwd == os.path.join(test_dir, 'subdir1')
+    assert selector._directory.value == os.path.join(test_dir, 'subdir1')
+
+
+def test_file_selector_update_root_directory(test_dir):
+    selector = FileSelector(test_dir)
+
+    subdir1 = os.path.join(test_dir, 'subdir1')
+    selector.root_directory = subdir1
+
+    selector._directory.value = os.path.join(test_dir, 'subdir2')
+
+    assert selector._directory.value == subdir1
+
+
+async def _write_until_listed(selector, path):
+    # The watch starts asynchronously, so keep modifying the file until
+    # a change is picked up rather than waiting a fixed time
+    def _write_and_check():
+        with open(path, 'a') as f:
+            f.write('x')
+        assert os.path.basename(path) in selector._selector.options
+
+    await async_wait_until(_write_and_check)
+
+
+def test_file_selector_refresh_periodic_fallback(test_dir):
+    selector = FileSelector(test_dir, refresh_period=100)
+
+    assert selector._watching is None
+    assert selector._periodic.running
+    assert selector._periodic.period == 100
+
+    selector.refresh_period = None
+
+    assert not selector._periodic.running
+
+
+async def test_file_selector_refresh_periodic_without_watchfiles(test_dir, monkeypatch):
+    monkeypatch.setattr('panel.widgets.file_selector.import_available', lambda module: False)
+    selector = FileSelector(test_dir, refresh_period=100)
+
+    assert selector._watching is None
+    assert selector._periodic.running
+
+    selector.refresh_period = None
+
+
+@watchfiles_available
+async def test_file_selector_refresh_watch(test_dir):
+    selector = FileSelector(test_dir, refresh_period=50)
+
+    assert selector._watching in state._watch_events
+    assert not selector._periodic.running
+
+    await _write_until_listed(selector, os.path.join(test_dir, 'new'))
+
+    selector.refresh_period = None
+
+    assert selector._watching is None
+
+
+@watchfiles_available
+async def test_file_selector_refresh_watch_follows_navigation(test_dir):
+    selector = FileSelector(test_dir, refresh_period=50)
+    event = selector._watching
+
+    selector._directory.value = os.path.join(test_dir, 'subdir2')
+    selector._go.clicks = 1
+
+    assert event.is_set()
+    assert event not in state._watch_events
+    assert selector._watching is not event
+    assert selector._watching in state._watch_events
+
+    await _write_until_listed(selector, os.path.join(test_dir, 'subdir2', 'new'))
+
+    selector.refresh_period = None
+
+
+@watchfiles_available
+async def test_file_selector_refresh_watch_cleanup(test_dir, document, comm):
+    selector = FileSelector(test_dir, refresh_period=50)
+
+    root = selector.get_root(document, comm)
+    event = selector._watching
+
+    assert event in state._watch_events
+
+    selector._cleanup(root)
+
+    assert event.is_set()
+    assert event not in state._watch_events
+    assert selector._watching is None
+
+
+def _select_many(test_dir):
+    from panel.widgets import file_selector
+
+    subdir1 = os.path.join(test_dir, 'subdir1')
+    names = [f'f{i}' for i in range(file_selector._STAT_THREAD_THRESHOLD)]
+    for name in names:
+        with open(os.path.join(subdir1, name), 'w'):
+            pass
+    selected = [os.path.join(subdir1, name) for name in names]
+    options = dict({
+        '\U0001f4c1subdir1': subdir1,
+        '\U0001f4c1subdir2': os.path.join(test_dir, 'subdir2'),
+    }, **{os.path.join('subdir1', name): path for name, path in zip(names, selected)})
+    return selected+[os.path.join(test_dir, 'missing')], options
+
+
+def test_file_selector_classify_many_selected(test_dir, monkeypatch):
+    from panel.widgets import file_selector
+
+    monkeypatch.setattr(state, '_thread_pool', None)
+    selected, options = _select_many(test_dir)
+
+    selector = FileSelector(test_dir, value=selected)
+
+    assert file_selector._stat_pool is not None
+    assert selector._selector.options == options
+
+
+def test_file_selector_classify_many_selected_on_thread_pool(test_dir, monkeypatch):
+    # Callbacks may run on panel's thread pool, classifying paths must
+    # not wait on that same pool
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(state, '_thread_pool', pool)
+    selected, options = _select_many(test_dir)
+
+    try:
+        future = pool.submit(FileSelector, test_dir, value=selected)
+        selector = future.result(timeout=10)
+    finally:
+        pool.shutdown(wait=False)
+
+    assert selector._selector.options == options
+
+
+def test_file_selector_scan_cache(test_dir, scan_calls, monkeypatch):
+    selector = FileSelector(test_dir)
+
+    assert scan_calls == [test_dir]
+
+    selector._directory.value = os.path.join(test_dir, 'subdir1')
+    selector._go.clicks = 1
+    selector._back.clicks = 1
+
+    # Navigating back within the TTL reuses the listing
+    assert scan_calls == [test_dir, os.path.join(test_dir, 'subdir1')]
+
+    selector._reload.clicks = 1
+
+    # Reloading bypasses the cache
+    assert scan_calls == [test_dir, os.path.join(test_dir, 'subdir1'), test_dir]
+
+    monkeypatch.setattr(FileSelector, '_scan_ttl', 0)
+    selector._forward.clicks = 1
+
+    assert scan_calls[-1] == os.path.join(test_dir, 'subdir1')
+    assert len(scan_calls) == 4
+
+
+def test_file_selector_filter_denylist_reuses_listing(test_dir, scan_calls, monkeypatch):
+    monkeypatch.setattr(FileSelector, '_scan_ttl', 0)
+    selector = FileSelector(test_dir)
+
+    selector._directory.value = os.path.join(test_dir, 'subdir1')
+    selector._go.clicks = 1
+
+    assert len(scan_calls) == 2
+
+    selector._selector._lists[False].value = ['a']
+    selector._selector._buttons[True].clicks = 1
+    selector._selector._lists[True].value = ['a']
+    selector._selector._buttons[False].clicks = 1
+
+    assert selector._selector._lists[False].options == ['⬆ ..', 'a', 'b']
+    assert len(scan_calls) == 2
@@ -4,27 +4,46 @@ directories on the server.
 """
 from __future__ import annotations
 
+import asyncio
 import os
+import stat
+import threading
+import time
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from fnmatch import fnmatch
-from typing import AnyStr, ClassVar, Optional
+from functools import partial
+from itertools import chain
+from typing import (
+    TYPE_CHECKING, AnyStr, ClassVar, Iterable, Optional,
+)
 
 import param
 
 from ..io import PeriodicCallback
+from ..io.state import state
 from ..layout import (
     Column, Divider, ListPanel, Row,
 )
 from ..models.widgets import DoubleClickEvent
 from ..util import fullpath
+from ..util.checks import import_available
 from ..viewable import Layoutable
 from .base import CompositeWidget
 from .button import Button
 from .input import TextInput
 from .select import CrossSelector
 
+if TYPE_CHECKING:
+    from bokeh.document import Document
+    from bokeh.model import Model
+    from pyviz_comms import Comm
+
 
-def _scan_path(path: str, file_pattern='*') -> tuple[list[str], list[str]]:
+def _scan_path(
+    path: str, file_pattern='*', show_hidden: bool = True
+) -> tuple[list[str], list[str]]:
     """
     Scans the supplied path for files and directories and optionally
     filters the files with the file keyword, returning a list of sorted
@@ -36,28 +55,138 @@ def _scan_path(path: str, file_pattern='*') -> tuple[list[str], list[str]]:
         The path to search
     file_pattern: str
         A glob-like pattern to filter the files
+    show_hidden: bool
+        Whether to include hidden files and directories (starting
+        with a period)
 
     Returns
     -------
     A sorted list of directory paths, A sorted list of files
     """
-    paths = [os.path.join(path, p) for p in os.listdir(path)]
-    dirs = [p for p in paths if os.path.isdir(p)]
-    files = [p for p in paths if os.path.isfile(p) and
-             fnmatch(os.path.basename(p), file_pattern)]
-    for p in paths:
-        if not os.path.islink(p):
-            continue
-        path = os.path.realpath(p)
-        if os.path.isdir(path):
-            dirs.append(p)
-        elif os.path.isfile(path):
-            dirs.append(p)
-        else:
-            continue
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not show_hidden and entry.name.startswith('.'):
+                continue
+            if entry.is_symlink():
+                # Resolve symlinks so links to directories are browsable,
+                # skipping looping or inaccessible links
+                try:
+                    is_dir, is_file = entry.is_dir(), entry.is_file()
+                except OSError:
+                    continue
+            else:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = entry.is_file(follow_symlinks=False)
+            if is_dir:
+                dirs.append(entry.path)
+            elif is_file and fnmatch(entry.name, file_pattern):
+                files.append(entry.path)
     return dirs, files
 
 
+def _classify(path: str) -> str | None:
+    """
+    Classifies the supplied path as a directory or file, resolving
+    symlinks, with at most two stat calls.
+
+    Arguments
+    ---------
+    path: str
+        The path to classify
+
+    Returns
+    -------
+    'dir', 'file' or None if the path does not exist or is neither.
+    """
+    try:
+        st = os.lstat(path)
+        if stat.S_ISLNK(st.st_mode):
+            st = os.stat(path)
+    except OSError:
+        return None
+    if stat.S_ISDIR(st.st_mode):
+        return 'dir'
+    elif stat.S_ISREG(st.st_mode):
+        return 'file'
+    return None
+
+
+# Number of threads used to classify selected paths
+_STAT_WORKERS = 8
+
+# Minimum number of selected paths before classification is threaded
+_STAT_THREAD_THRESHOLD = 8
+
+_stat_pool: ThreadPoolExecutor | None = None
+
+_stat_pool_lock = threading.Lock()
+
+
+def _get_stat_pool() -> ThreadPoolExecutor:
+    """
+    Returns the shared pool used to classify paths, creating it on
+    first use. panel's own state._thread_pool must not be used since
+    FileSelector callbacks may already be running on one of its
+    workers, which would deadlock waiting on its own pool.
+    """
+    global _stat_pool
+    with _stat_pool_lock:
+        if _stat_pool is None:
+            _stat_pool = ThreadPoolExecutor(
+                max_workers=_STAT_WORKERS, thread_name_prefix='FileSelector'
+            )
+    return _stat_pool
+
+
+def _classify_all(paths: list[str]) -> list[str | None]:
+    """
+    Classifies the supplied paths (see _classify), dispatching the
+    stat calls to a thread pool when there are enough of them for the
+    overhead to pay off, e.g. on network mounted filesystems.
+
+    Arguments
+    ---------
+    paths: list[str]
+        The paths to classify
+
+    Returns
+    -------
+    A list of 'dir', 'file' or None for each path.
+    """
+    if len(paths) < _STAT_THREAD_THRESHOLD:
+        return [_classify(p) for p in paths]
+    return list(_get_stat_pool().map(_classify, paths))
+
+
+def _abbreviate(paths: Iterable[str], dirs: list[str], cwd: str) -> dict[str, str]:
+    """
+    Abbreviates the supplied paths relative to the current working
+    directory, prefixing directories with a folder icon.
+
+    Arguments
+    ---------
+    paths: Iterable[str]
+        The paths to abbreviate
+    dirs: list[str]
+        The subset of paths which are directories
+    cwd: str
+        The directory to abbreviate the paths relative to
+
+    Returns
+    -------
+    A dictionary mapping from abbreviated paths to paths.
+    """
+    dirs = set(dirs)
+    prefix = cwd if cwd.endswith(os.path.sep) else cwd + os.path.sep
+    offset = len(prefix)
+    return {
+        ('📁' if p in dirs else '') +
+        (p[offset:] if p.startswith(prefix) else os.path.relpath(p, cwd)): p
+        for p in paths
+    }
+
+
 class FileSelector(CompositeWidget):
     """
     The `FileSelector` widget allows browsing the filesystem on the
@@ -88,8 +217,11 @@ class FileSelector(CompositeWidget):
         way to control the height of this widget)""")
 
     refresh_period = param.Integer(default=None, doc="""
-        If set to non-None value indicates how frequently to refresh
-        the directory contents in milliseconds.""")
+        If set to non-None value enables refreshing the directory
+        contents. If watchfiles is installed and an event loop is
+        running the directory is watched for changes, which are
+        debounced by this period in milliseconds; otherwise the
+        directory is polled with this period in milliseconds.""")
 
     root_directory = param.String(default=None, doc="""
         If set, overrides directory parameter as the root directory
@@ -100,6 +232,12 @@ class FileSelector(CompositeWidget):
 
     _composite_type: ClassVar[type[ListPanel]] = Column
 
+    # Maximum number of directories kept in the navigation history
+    _history_size: ClassVar[int] = 256
+
+    # Time in seconds for which a directory listing is reused
+    _scan_ttl: ClassVar[float] = 0.5
+
     def __init__(self, directory: AnyStr | os.PathLike | None = None, **params):
         from ..pane import Markdown
         if directory is not None:
@@ -137,9 +275,13 @@ class FileSelector(CompositeWidget):
         self.link(self._selector, size='size')
 
         # Set up state
-        self._stack = []
+        self._scan_cache: dict[tuple[str, str, bool], tuple[float, list[str], list[str]]] = {}
+        self._stack: deque[str] = deque(maxlen=self._history_size)
         self._cwd = None
+        self._last_scan: tuple[list[str], list[str]] = ([], [])
+        self._last_update = 0.
         self._position = -1
+        self._watching: asyncio.Event | None = None
         self._update_files(True)
 
         # Set up callback
@@ -156,27 +298,87 @@ class FileSelector(CompositeWidget):
         self._selector._lists[False].param.watch(self._filter_denylist, 'options')
         self._periodic = PeriodicCallback(callback=self._refresh, period=self.refresh_period or 0)
         self.param.watch(self._update_periodic, 'refresh_period')
-        if self.refresh_period:
-            self._periodic.start()
+        self._setup_refresh()
+
+    def _resolve_option(self, option: str) -> tuple[str, bool]:
+        """
+        Resolves an option label to a path and whether it is a
+        directory. Directories are labelled with a folder icon by
+        _update_files so only other labels require a stat call.
+        """
+        relpath = option.replace('📁', '').replace('⬆ ', '')
+        path = os.path.normpath(os.path.join(self._cwd, relpath))
+        return path, option.startswith('📁') or os.path.isdir(path)
 
     def _select_and_go(self, event: DoubleClickEvent):
-        relpath = event.option.replace('📁', '').replace('⬆ ', '')
-        if relpath == '..':
+        if event.option == '⬆ ..':
             return self._go_up()
-        sel = fullpath(os.path.join(self._cwd, relpath))
-        if os.path.isdir(sel):
+        sel, is_dir = self._resolve_option(event.option)
+        if is_dir:
             self._directory.value = sel
         else:
             self._directory.value = self._cwd
         self._update_files()
 
     def _update_periodic(self, event: param.parameterized.Event):
-        if event.new:
-            self._periodic.period = event.new
+        self._setup_refresh()
+
+    def _setup_refresh(self):
+        """
+        Refreshes the directory contents when the filesystem changes
+        if watchfiles is available and an event loop is running,
+        otherwise polls the directory every refresh_period.
+        """
+        self._stop_watching()
+        if not self.refresh_period:
+            if self._periodic.running:
+                self._periodic.stop()
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop_running = False
+        else:
+            loop_running = True
+        if loop_running and self._cwd and import_available('watchfiles'):
+            if self._periodic.running:
+                self._periodic.stop()
+            self._watching = event = asyncio.Event()
+            state._watch_events.append(event)
+            state.execute(partial(self._watch_directory, self._cwd, event))
+        else:
+            self._periodic.period = self.refresh_period
             if not self._periodic.running:
                 self._periodic.start()
-        elif self._periodic.running:
-            self._periodic.stop()
+
+    def _stop_watching(self):
+        if self._watching is None:
+            return
+        self._watching.set()
+        if self._watching in state._watch_events:
+            state._watch_events.remove(self._watching)
+        self._watching = None
+
+    async def _watch_directory(self, path: str, stop_event: asyncio.Event):
+        import watchfiles
+        async for _ in watchfiles.awatch(
+            path, stop_event=stop_event, recursive=False,
+            debounce=self.refresh_period
+        ):
+            self._update_files(refresh=True)
+
+    def _cleanup(self, root: Model | None = None) -> None:
+        super()._cleanup(root)
+        if not self._models:
+            self._stop_watching()
+
+    def _get_model(
+        self, doc: Document, root: Optional[Model] = None,
+        parent: Optional[Model] = None, comm: Optional[Comm] = None
+    ) -> Model:
+        if self.refresh_period and self._watching is None and not self._periodic.running:
+            self._setup_refresh()
+        return super()._get_model(doc, root, parent, comm)
 
     @property
     def _root_directory(self):
@@ -187,16 +389,46 @@ class FileSelector(CompositeWidget):
         self._selector.value = value
         self.value = value
 
+    @param.depends('root_directory', 'directory', watch=True, on_init=True)
+    def _update_root_prefix(self):
+        # Separator terminated so that e.g. /root2 does not match /root
+        self._root_prefix = self._root_directory.rstrip(os.path.sep) + os.path.sep
+
+    def _within_root(self, path: str) -> bool:
+        return (path.rstrip(os.path.sep) + os.path.sep).startswith(self._root_prefix)
+
     def _dir_change(self, event: param.parameterized.Event):
         path = fullpath(self._directory.value)
-        if not path.startswith(self._root_directory):
+        if not self._within_root(path):
             self._directory.value = self._root_directory
             return
         elif path != self._directory.value:
             self._directory.value = path
         self._go.disabled = path == self._cwd
 
+    def _scan(self, path: str, refresh: bool = False) -> tuple[list[str], list[str]]:
+        """
+        Scans the path, reusing a recent listing unless refresh is set.
+        The returned lists are shared with the cache and must not be
+        modified.
+        """
+        key = (path, self.file_pattern, self.show_hidden)
+        now = time.monotonic()
+        if not refresh and key in self._scan_cache:
+            timestamp, dirs, files = self._scan_cache[key]
+            if now - timestamp < self._scan_ttl:
+                return dirs, files
+        dirs, files = _scan_path(path, self.file_pattern, self.show_hidden)
+        self._scan_cache = {
+            k: v for k, v in self._scan_cache.items() if now - v[0] < self._scan_ttl
+        }
+        self._scan_cache[key] = (now, dirs, files)
+        return dirs, files
+
     def _refresh(self):
+        # Skip if the listing was just updated, e.g. by user navigation
+        if time.monotonic() - self._last_update < (self.refresh_period or 0) / 2000:
+            return
         self._update_files(refresh=True)
 
     def _update_files(
@@ -206,15 +438,24 @@ class FileSelector(CompositeWidget):
         refresh = refresh or (event and getattr(event, 'obj', None) is self._reload)
         if refresh:
             path = self._cwd
-        elif not os.path.isdir(path):
+        elif not self._within_root(path):
+            self._directory.value = path = self._root_directory
+        try:
+            dirs, files = self._scan(path, refresh)
+        except (OSError, ValueError):
             self._selector.options = ['Entered path is not valid']
             self._selector.disabled = True
             return
-        elif event is not None and (not self._stack or path != self._stack[-1]):
+        if not refresh and event is not None and (not self._stack or path != self._stack[-1]):
             self._stack.append(path)
-            self._position += 1
+            self._position = min(self._position+1, len(self._stack)-1)
 
+        cwd_changed = path != self._cwd
         self._cwd = path
+        self._last_scan = (dirs, files)
+        if cwd_changed and self._watching is not None:
+            # Move the filesystem watcher to the new directory
+            self._setup_refresh()
         if not refresh:
             self._go.disabled = True
         self._up.disabled = path == self._root_directory
@@ -224,29 +465,19 @@ class FileSelector(CompositeWidget):
             self._back.disabled = False
 
         selected = self.value
-        dirs, files = _scan_path(path, self.file_pattern)
-        for s in selected:
-            check = os.path.realpath(s) if os.path.islink(s) else s
-            if os.path.isdir(check):
-                dirs.append(s)
-            elif os.path.isfile(check):
-                files.append(s)
-
-        paths = [
-            p for p in sorted(dirs)+sorted(files)
-            if self.show_hidden or not os.path.basename(p).startswith('.')
-        ]
-        abbreviated = [
-            ('📁' if f in dirs else '')+os.path.relpath(f, self._cwd)
-            for f in paths
-        ]
-        if not self._up.disabled:
-            paths.insert(0, '..')
-            abbreviated.insert(0, '⬆ ..')
-
-        options = dict(zip(abbreviated, paths))
+        selected_dirs, selected_files = [], []
+        for s, kind in zip(selected, _classify_all(selected)):
+            if kind == 'dir':
+                selected_dirs.append(s)
+            elif kind == 'file':
+                selected_files.append(s)
+        dirs, files = dirs+selected_dirs, files+selected_files
+
+        options = {} if self._up.disabled else {'⬆ ..': '..'}
+        options.update(_abbreviate(chain(sorted(dirs), sorted(files)), dirs, self._cwd))
         self._selector.options = options
         self._selector.value = selected
+        self._last_update = time.monotonic()
 
     def _filter_denylist(self, event: param.parameterized.Event):
         """
@@ -254,8 +485,11 @@ class FileSelector(CompositeWidget):
         is not in the current working directory then it is removed
         from the denylist.
         """
-        dirs, files = _scan_path(self._cwd, self.file_pattern)
-        paths = [('📁' if p in dirs else '')+os.path.relpath(p, self._cwd) for p in dirs+files]
+        if not isinstance(self._selector.options, dict):
+            # Options were replaced by an invalid path message
+            return
+        dirs, files = self._last_scan
+        paths = _abbreviate(chain(dirs, files), dirs, self._cwd)
         denylist = self._selector._lists[False]
         options = dict(self._selector._items)
         self._selector.options.clear()
@@ -273,9 +507,8 @@ class FileSelector(CompositeWidget):
             self._directory.value = self._cwd
             return
 
-        relpath = event.new[0].replace('📁', '').replace('⬆ ', '')
-        sel = fullpath(os.path.join(self._cwd, relpath))
-        if os.path.isdir(sel):
+        sel, is_dir = self._resolve_option(event.new[0])
+        if is_dir:
             self._directory.value = sel
         else:
             self._directory.value = self._cwd